@@ -0,0 +1,62 @@
+"""Cache key conventions and TTL policy for the data cache.
+
+Keys follow ``smcgov_housing:{domain}:{identifier}:{sub...}`` so that every
+entry of a domain can be dropped with
+``cache_manager.invalidate_prefix(domain_prefix(domain))``.
+"""
+
+import hashlib
+from datetime import date
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from config.settings import settings
+
+# Namespace shared with cache_manager's own keys and its Redis patterns
+KEY_PREFIX = "smcgov_housing:"
+
+# Time to live per key domain, in seconds
+TTL = {
+    "scrape": 900,
+    "pdf": settings.cache_ttl_income_limits * 3600,
+    "dashboard": settings.cache_ttl_hours * 3600,
+    "notices": settings.cache_ttl_notices * 3600,
+}
+
+
+def make_key(domain: str, identifier: Any, *sub: Any) -> str:
+    """Build a cache key from a domain, an identifier and optional parts."""
+    return KEY_PREFIX + ":".join(str(part) for part in (domain, identifier, *sub))
+
+
+def domain_prefix(domain: str) -> str:
+    """Prefix matching every key of a domain, for invalidate_prefix."""
+    return f"{KEY_PREFIX}{domain}:"
+
+
+def ttl_hours(domain: str) -> float:
+    """Get a domain's TTL in hours, as cache_manager.set expects."""
+    return TTL[domain] / 3600
+
+
+def scrape_key(url: str, *sub: Any) -> str:
+    """Key for a scraped page, e.g. ``smcgov_housing:scrape:smcgov:<sha1 of url>``."""
+    host = urlparse(url).hostname or ""
+    labels = host.split(".")
+    site = labels[-2] if len(labels) > 1 else host
+    return make_key("scrape", site, hashlib.sha1(url.encode()).hexdigest(), *sub)
+
+
+def pdf_key(kind: str, year: Any, *sub: Any) -> str:
+    """Key for data parsed from a PDF, e.g. ``smcgov_housing:pdf:income_limits:2025``."""
+    return make_key("pdf", kind, year, *sub)
+
+
+def dashboard_key(name: str, day: Optional[date] = None) -> str:
+    """Key for dashboard data, e.g. ``smcgov_housing:dashboard:stats:2025-01-31``."""
+    return make_key("dashboard", name, (day or date.today()).isoformat())
+
+
+def notice_key(limit: Optional[int], date_range_days: Optional[int] = None) -> str:
+    """Key for a public notices listing."""
+    return make_key("notices", "limit", limit, "days", date_range_days)
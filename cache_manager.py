@@ -167,6 +167,37 @@ class CacheManager:
             logger.error("Cache delete failed", key=key, error=str(e))
             return False
     
+    async def invalidate_prefix(self, prefix: str) -> int:
+        """Delete every cached entry whose key starts with prefix."""
+        try:
+            # Remove from memory cache
+            keys = {key for key in self._memory_cache if key.startswith(prefix)}
+            for key in keys:
+                del self._memory_cache[key]
+            
+            # Remove from Redis cache
+            if self._redis_client:
+                try:
+                    redis_keys = list(self._redis_client.scan_iter(match=f"{prefix}*"))
+                    if redis_keys:
+                        self._redis_client.delete(*redis_keys)
+                    keys.update(k.decode() if isinstance(k, bytes) else k for k in redis_keys)
+                except Exception as e:
+                    logger.warning("Redis invalidate failed", prefix=prefix, error=str(e))
+            
+            # Remove from file cache
+            for cache_file in self.cache_dir.glob("*.json"):
+                if cache_file.stem.startswith(prefix):
+                    cache_file.unlink()
+                    keys.add(cache_file.stem)
+            
+            logger.info("Cache prefix invalidated", prefix=prefix, count=len(keys))
+            return len(keys)
+            
+        except Exception as e:
+            logger.error("Cache invalidate failed", prefix=prefix, error=str(e))
+            return 0
+    
     async def clear(self) -> bool:
         """Clear all cache data."""
         try:
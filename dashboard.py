@@ -6,8 +6,9 @@ from typing import Optional, Dict, Any
 import structlog
 
 from config.urls import URLS, DASHBOARD_SELECTORS
-from utils.web_scraper_simple import scraper
+from utils.web_scraper import scraper
 from processors.cache_manager import cache_manager
+from processors.cache_keys import dashboard_key, ttl_hours
 from models import HousingStatistics
 
 logger = structlog.get_logger()
@@ -16,26 +17,23 @@ logger = structlog.get_logger()
 class DashboardExtractor:
     """Extractor for housing dashboard data."""
     
-    def __init__(self):
-        self.cache_key = "dashboard_statistics"
-    
     async def get_housing_statistics(self, use_cache: bool = True) -> Optional[HousingStatistics]:
         """Get housing statistics from the dashboard."""
         try:
             # Check cache first
             if use_cache:
-                cached_data = await cache_manager.get(self.cache_key)
+                cached_data = await cache_manager.get(dashboard_key("stats"))
                 if cached_data:
                     logger.info("Retrieved housing statistics from cache")
                     return HousingStatistics(**cached_data)
             
             # Scrape fresh data
             logger.info("Scraping housing statistics from dashboard")
-            stats = await self._scrape_dashboard_data()
+            stats = await self._scrape_dashboard_data(use_cache)
             
             if stats:
                 # Cache the data
-                await cache_manager.set(self.cache_key, stats.dict(), ttl_hours=24)
+                await cache_manager.set(dashboard_key("stats"), stats.dict(), ttl_hours=ttl_hours("dashboard"))
                 logger.info("Cached housing statistics")
                 return stats
             
@@ -45,11 +43,12 @@ class DashboardExtractor:
             logger.error("Failed to get housing statistics", error=str(e))
             return None
     
-    async def _scrape_dashboard_data(self) -> Optional[HousingStatistics]:
+    async def _scrape_dashboard_data(self, use_cache: bool = True) -> Optional[HousingStatistics]:
         """Scrape data from the dashboard page."""
         try:
             # Get page content using Selenium for dynamic content
-            html_content = await scraper.get_page_content(URLS["dashboards"], use_selenium=True)
+            html_content = await scraper.get_page_content(URLS["dashboards"], use_selenium=True,
+                                                          use_cache=use_cache)
             if not html_content:
                 return None
             
@@ -226,7 +225,7 @@ class DashboardExtractor:
     async def get_funding_details(self) -> Optional[Dict[str, Any]]:
         """Get detailed funding information."""
         try:
-            cache_key = "funding_details"
+            cache_key = dashboard_key("funding")
             
             # Check cache
             cached_data = await cache_manager.get(cache_key)
@@ -249,7 +248,7 @@ class DashboardExtractor:
             }
             
             # Cache the data
-            await cache_manager.set(cache_key, funding_details, ttl_hours=24)
+            await cache_manager.set(cache_key, funding_details, ttl_hours=ttl_hours("dashboard"))
             
             return funding_details
             
@@ -0,0 +1,163 @@
+"""On-disk HTTP response cache with ETag/Last-Modified revalidation."""
+
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+import structlog
+
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def file_key(url: str) -> str:
+    """Cache key for a downloaded file.
+    
+    Files are stored under their own key, apart from page bodies, so a page
+    fetch of the same URL never finds one and tries to decode it as text.
+    """
+    return f"file:{url}"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """A stored response body and its validators."""
+
+    body: bytes
+    encoding: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry can be served without asking the server."""
+        return self.expires_at > time.time()
+
+    @property
+    def text(self) -> str:
+        """The body decoded with the charset it was served with."""
+        return self.body.decode(self.encoding)
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """SQLite-backed cache of HTTP response bodies keyed by URL.
+
+    Entries are fresh for the response's Cache-Control max-age, or
+    ``expire_after`` seconds without one. Stale entries are kept so they can
+    be revalidated with a conditional GET; a 304 renews them in place.
+    Database access runs in a worker thread.
+    """
+
+    def __init__(self, path: Path, expire_after: int = 3600):
+        self.path = path
+        self.expire_after = expire_after
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, body BLOB NOT NULL, encoding TEXT NOT NULL, "
+                "etag TEXT, last_modified TEXT, expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def _lifetime(self, headers: Mapping[str, str]) -> Optional[int]:
+        """Freshness lifetime from Cache-Control, or None if not storable."""
+        cache_control = headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            return None
+        if "no-cache" in cache_control:
+            return 0
+        match = _MAX_AGE_RE.search(cache_control)
+        return int(match.group(1)) if match else self.expire_after
+
+    def _get_sync(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT body, encoding, etag, last_modified, expires_at "
+                "FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def _store_sync(self, url: str, body: bytes, encoding: str,
+                    headers: Mapping[str, str]) -> None:
+        lifetime = self._lifetime(headers)
+        if lifetime is None:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, body, encoding, headers.get("ETag"), headers.get("Last-Modified"),
+                 time.time() + lifetime)
+            )
+
+    def _refresh_sync(self, url: str, headers: Mapping[str, str]) -> None:
+        lifetime = self._lifetime(headers)
+        with self._lock, self._connect() as conn:
+            if lifetime is None:
+                conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            else:
+                conn.execute(
+                    "UPDATE responses SET expires_at = ? WHERE url = ?",
+                    (time.time() + lifetime, url)
+                )
+
+    async def get(self, url: str) -> Optional[CachedResponse]:
+        """Get the stored response for a URL, fresh or stale."""
+        try:
+            return await asyncio.to_thread(self._get_sync, url)
+        except sqlite3.Error as e:
+            logger.warning("HTTP cache read failed", url=url, error=str(e))
+            return None
+
+    async def store(self, url: str, body: bytes, encoding: str,
+                    headers: Mapping[str, str]) -> None:
+        """Store a 200 response unless it is marked no-store."""
+        try:
+            await asyncio.to_thread(self._store_sync, url, body, encoding, headers)
+        except sqlite3.Error as e:
+            logger.warning("HTTP cache write failed", url=url, error=str(e))
+
+    async def refresh(self, url: str, headers: Mapping[str, str]) -> None:
+        """Renew a stored response after a 304 Not Modified."""
+        try:
+            await asyncio.to_thread(self._refresh_sync, url, headers)
+        except sqlite3.Error as e:
+            logger.warning("HTTP cache refresh failed", url=url, error=str(e))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global HTTP cache instance, stored alongside the data cache
+http_cache = HTTPCache(
+    Path.home() / ".smcgov_housing_cache" / "http_cache.sqlite",
+    expire_after=settings.http_cache_ttl_seconds
+)
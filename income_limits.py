@@ -1,15 +1,19 @@
 """Income limits extractor for PDF processing."""
 
+import asyncio
+import os
 import tempfile
+from collections import defaultdict
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 import structlog
 
-from config.urls import INCOME_LIMITS_PDFS
-from utils.web_scraper_simple import scraper
-from utils.pdf_parser_simple import pdf_parser
+from config.urls import INCOME_LIMITS_PDFS, income_limits_url
+from utils.web_scraper import scraper
+from utils.pdf_parser import pdf_parser
 from processors.cache_manager import cache_manager
+from processors.cache_keys import pdf_key, ttl_hours
 from models import IncomeLimits
 
 logger = structlog.get_logger()
@@ -21,12 +25,15 @@ class IncomeLimitsExtractor:
     def __init__(self):
         self.temp_dir = Path(tempfile.gettempdir()) / "smcgov_income_limits"
         self.temp_dir.mkdir(exist_ok=True)
+        # One download and parse per year at a time; a concurrent caller for
+        # the same year then finds the PDF in the HTTP cache
+        self._year_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
     
     async def get_income_limits(self, year: Optional[int] = None, family_size: Optional[int] = None, 
                               use_cache: bool = True) -> List[IncomeLimits]:
         """Get income limits data, optionally filtered by year and family size."""
         try:
-            cache_key = f"income_limits:year:{year}:family_size:{family_size}"
+            cache_key = pdf_key("income_limits", year, "family_size", family_size)
             
             # Check cache first
             if use_cache:
@@ -44,8 +51,8 @@ class IncomeLimitsExtractor:
             years_to_process = [year] if year else [2025, 2024, 2023]
             
             for target_year in years_to_process:
-                if str(target_year) in INCOME_LIMITS_PDFS:
-                    limits = await self._extract_income_limits_for_year(target_year)
+                if target_year in INCOME_LIMITS_PDFS:
+                    limits = await self._extract_income_limits_for_year(target_year, use_cache)
                     all_income_limits.extend(limits)
             
             # Filter by family size if specified
@@ -56,7 +63,7 @@ class IncomeLimitsExtractor:
             # Cache the results
             if all_income_limits:
                 cache_data = [limit.dict() for limit in all_income_limits]
-                await cache_manager.set(cache_key, cache_data, ttl_hours=720)  # 30 days
+                await cache_manager.set(cache_key, cache_data, ttl_hours=ttl_hours("pdf"))
                 logger.info("Cached income limits data", count=len(all_income_limits))
             
             return all_income_limits
@@ -65,30 +72,34 @@ class IncomeLimitsExtractor:
             logger.error("Failed to get income limits", year=year, family_size=family_size, error=str(e))
             return []
     
-    async def _extract_income_limits_for_year(self, year: int) -> List[IncomeLimits]:
+    async def _extract_income_limits_for_year(self, year: int, use_cache: bool = True) -> List[IncomeLimits]:
         """Extract income limits for a specific year."""
         try:
-            pdf_url = INCOME_LIMITS_PDFS.get(str(year))
+            pdf_url = income_limits_url(year)
             if not pdf_url:
                 logger.warning("No PDF URL found for year", year=year)
                 return self._get_mock_income_limits(year)
             
-            # Download PDF
-            pdf_path = self.temp_dir / f"income_limits_{year}.pdf"
-            success = await scraper.download_file(pdf_url, str(pdf_path))
-            
-            if not success:
-                logger.error("Failed to download income limits PDF, using mock data", year=year, url=pdf_url)
-                return self._get_mock_income_limits(year)
-            
-            # Parse PDF
-            income_limits = await pdf_parser.parse_income_limits_pdf(str(pdf_path), year)
-            
-            # Clean up PDF file
-            try:
-                pdf_path.unlink()
-            except Exception:
-                pass
+            async with self._year_locks[year]:
+                # Download to a file of our own so no other call can overwrite
+                # or remove it mid-parse
+                fd, temp_name = tempfile.mkstemp(prefix=f"income_limits_{year}_", suffix=".pdf",
+                                                 dir=self.temp_dir)
+                os.close(fd)
+                pdf_path = Path(temp_name)
+                try:
+                    success = await scraper.download_file(pdf_url, str(pdf_path), use_cache=use_cache)
+                    
+                    if not success:
+                        logger.error("Failed to download income limits PDF, using mock data",
+                                     year=year, url=pdf_url)
+                        return self._get_mock_income_limits(year)
+                    
+                    # Parse PDF
+                    income_limits = await pdf_parser.parse_income_limits_pdf(str(pdf_path), year)
+                finally:
+                    # Clean up PDF file
+                    pdf_path.unlink(missing_ok=True)
             
             logger.info("Extracted income limits for year", year=year, count=len(income_limits))
             return income_limits
@@ -118,7 +129,7 @@ class IncomeLimitsExtractor:
     async def get_income_limits_summary(self) -> Dict[str, Any]:
         """Get a summary of available income limits data."""
         try:
-            cache_key = "income_limits_summary"
+            cache_key = pdf_key("income_limits", "summary")
             
             # Check cache
             cached_data = await cache_manager.get(cache_key)
@@ -126,7 +137,7 @@ class IncomeLimitsExtractor:
                 return cached_data
             
             summary = {
-                'available_years': list(INCOME_LIMITS_PDFS.keys()),
+                'available_years': [str(year) for year in INCOME_LIMITS_PDFS],
                 'family_sizes': list(range(1, 9)),  # Typically 1-8 person families
                 'ami_categories': ['30%', '50%', '80%', '120%'],
                 'last_updated': datetime.now().isoformat()
@@ -139,7 +150,7 @@ class IncomeLimitsExtractor:
                 summary['total_records'] = len(recent_limits)
             
             # Cache the summary
-            await cache_manager.set(cache_key, summary, ttl_hours=168)  # 1 week
+            await cache_manager.set(cache_key, summary, ttl_hours=ttl_hours("pdf"))
             
             return summary
             
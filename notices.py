@@ -2,13 +2,14 @@
 
 import re
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from urllib.parse import urljoin
 import structlog
 
 from config.urls import URLS, BASE_URL
-from utils.web_scraper_simple import scraper
+from utils.web_scraper import scraper
 from processors.cache_manager import cache_manager
+from processors.cache_keys import domain_prefix, notice_key, ttl_hours
 from models import PublicNotice
 
 logger = structlog.get_logger()
@@ -18,14 +19,15 @@ class PublicNoticesExtractor:
     """Extractor for public notices and announcements."""
     
     def __init__(self):
-        self.base_cache_key = "public_notices"
+        # Fingerprint of the last scraped listing, to spot when it changes
+        self._listing_fingerprint: Optional[int] = None
     
     async def get_public_notices(self, limit: Optional[int] = None, 
                                date_range_days: Optional[int] = None,
                                use_cache: bool = True) -> List[PublicNotice]:
         """Get public notices, optionally filtered by limit and date range."""
         try:
-            cache_key = f"{self.base_cache_key}:limit:{limit}:days:{date_range_days}"
+            cache_key = notice_key(limit, date_range_days)
             
             # Check cache first
             if use_cache:
@@ -37,7 +39,16 @@ class PublicNoticesExtractor:
             
             # Scrape fresh data
             logger.info("Scraping public notices", limit=limit, date_range_days=date_range_days)
-            notices = await self._scrape_public_notices()
+            notices = await self._scrape_public_notices(use_cache)
+            
+            # A changed listing supersedes every cached listing; an unchanged
+            # one leaves the other limits and date ranges cached
+            fingerprint = hash(tuple(
+                (notice.title, notice.content_url, notice.date_published) for notice in notices
+            ))
+            if notices and fingerprint != self._listing_fingerprint:
+                await cache_manager.invalidate_prefix(domain_prefix("notices"))
+                self._listing_fingerprint = fingerprint
             
             # Apply filters
             if date_range_days:
@@ -51,7 +62,7 @@ class PublicNoticesExtractor:
             # Cache the results
             if notices:
                 cache_data = [notice.dict() for notice in notices]
-                await cache_manager.set(cache_key, cache_data, ttl_hours=6)
+                await cache_manager.set(cache_key, cache_data, ttl_hours=ttl_hours("notices"))
                 logger.info("Cached public notices", count=len(notices))
             
             return notices
@@ -60,37 +71,10 @@ class PublicNoticesExtractor:
             logger.error("Failed to get public notices", error=str(e))
             return []
     
-    async def _scrape_public_notices(self) -> List[PublicNotice]:
+    async def _scrape_public_notices(self, use_cache: bool = True) -> List[PublicNotice]:
         """Scrape public notices from the website."""
         try:
-            html_content = await scraper.get_page_content(URLS["public_notices"])
-            if not html_content:
-                return []
-            
-            soup = scraper.parse_html(html_content)
-            notices = []
-            
-            # Find notice links
-            notice_links = soup.find_all('a', href=True)
-            
-            for link in notice_links:
-                href = link.get('href')
-                title = link.get_text(strip=True)
-                
-                # Skip if not a notice link
-                if not self._is_notice_link(href, title):
-                    continue
-                
-                # Build full URL
-                if href.startswith('http'):
-                    full_url = href
-                else:
-                    full_url = urljoin(BASE_URL, href)
-                
-                # Extract notice information
-                notice = await self._extract_notice_info(title, full_url, link)
-                if notice:
-                    notices.append(notice)
+            notices = [notice async for notice in self._iter_public_notices(use_cache)]
             
             # Sort by date (most recent first)
             notices.sort(key=lambda x: x.date_published or datetime.min, reverse=True)
@@ -102,6 +86,55 @@ class PublicNoticesExtractor:
             logger.error("Failed to scrape public notices", error=str(e))
             return []
     
+    async def stream_notices(self, limit: Optional[int] = None,
+                             date_range_days: Optional[int] = None,
+                             use_cache: bool = True) -> AsyncIterator[PublicNotice]:
+        """Yield public notices as they are parsed, in page order.
+        
+        Unlike get_public_notices, notices are not sorted by date, since that
+        needs the whole listing first; the date filter and limit are applied
+        as notices arrive and the listing is not cached.
+        """
+        cutoff_date = datetime.now() - timedelta(days=date_range_days) if date_range_days else None
+        count = 0
+        async for notice in self._iter_public_notices(use_cache):
+            if cutoff_date and not (notice.date_published and notice.date_published >= cutoff_date):
+                continue
+            yield notice
+            count += 1
+            if limit and count >= limit:
+                return
+    
+    async def _iter_public_notices(self, use_cache: bool = True) -> AsyncIterator[PublicNotice]:
+        """Yield notices from the public notices page in page order."""
+        html_content = await scraper.get_page_content(URLS["public_notices"], use_cache=use_cache)
+        if not html_content:
+            return
+        
+        soup = scraper.parse_html(html_content)
+        
+        # Find notice links
+        notice_links = soup.find_all('a', href=True)
+        
+        for link in notice_links:
+            href = link.get('href')
+            title = link.get_text(strip=True)
+            
+            # Skip if not a notice link
+            if not self._is_notice_link(href, title):
+                continue
+            
+            # Build full URL
+            if href.startswith('http'):
+                full_url = href
+            else:
+                full_url = urljoin(BASE_URL, href)
+            
+            # Extract notice information
+            notice = await self._extract_notice_info(title, full_url, link)
+            if notice:
+                yield notice
+    
     def _is_notice_link(self, href: str, title: str) -> bool:
         """Check if a link is a notice link."""
         if not href or not title:
@@ -1,31 +1,64 @@
 """San Mateo County Housing MCP Server."""
 
 import asyncio
+import atexit
+import hashlib
 import json
+import logging
+import logging.handlers
+import os
+import queue
+import stat
 import sys
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import orjson
 import structlog
 
-# Configure structured logging
+# Rendered log lines are queued and written to stderr (stdout carries the MCP
+# protocol) by a background listener thread, so emitting a log never blocks
+# the event loop on locks or I/O.
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+
+
+class _QueueLogFile:
+    """Binary file-like sink that hands rendered structlog lines to the log queue."""
+    
+    def write(self, data: bytes) -> None:
+        _log_queue.put_nowait(logging.makeLogRecord({"msg": data.rstrip(b"\n").decode()}))
+    
+    def flush(self) -> None:
+        pass
+
+
+# Configure structured logging. Records are rendered to bytes with orjson and
+# bypass the stdlib logging machinery until the listener writes them out. The
+# processor chain is kept minimal: nothing here logs exc_info or stack_info,
+# so no traceback/stack renderers run per call.
 structlog.configure(
     processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=orjson.dumps)
     ],
     context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
+    logger_factory=structlog.BytesLoggerFactory(file=_QueueLogFile()),
+    wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
     cache_logger_on_first_use=True,
 )
 
+# Third-party stdlib loggers share the same queue
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
+
+# Started on import rather than in main() so every entry point (stdio, SSE,
+# test scripts) drains the queue, and stopped at interpreter exit rather than
+# in _cleanup() since a server may be cleaned up and reused.
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stderr))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = structlog.get_logger()
 
 # Import our modules
@@ -34,8 +67,41 @@ from extractors.dashboard import dashboard_extractor
 from extractors.income_limits import income_limits_extractor
 from extractors.notices import public_notices_extractor
 from processors.cache_manager import cache_manager
+from utils.web_scraper import scraper
 from models import MCPResponse
 
+# Current time as an ISO string, reformatted at most once a second so
+# per-request and per-keepalive timestamps do not each call datetime.now()
+_now_iso = datetime.now().isoformat()
+_now_iso_at = time.monotonic()
+
+
+def now_iso() -> str:
+    """Return the current timestamp, at most a second stale."""
+    global _now_iso, _now_iso_at
+    now = time.monotonic()
+    if now - _now_iso_at >= 1:
+        _now_iso = datetime.now().isoformat()
+        _now_iso_at = now
+    return _now_iso
+
+
+def json_default(obj: Any) -> Any:
+    """orjson fallback: dump Pydantic models directly, stringify anything else."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
+
+
+# Upper bound on responses coalesced into a single stdout write
+STDOUT_BATCH_MAX_BYTES = 64 * 1024
+
+# Longest request line accepted from stdin
+STDIN_LINE_LIMIT = 16 * 1024 * 1024
+
+# Entries kept by the in-process response cache when Redis is not configured
+RESPONSE_CACHE_MAX_ENTRIES = 256
+
 
 class SMCHousingMCPServer:
     """San Mateo County Housing MCP Server."""
@@ -226,6 +292,51 @@ class SMCHousingMCPServer:
                 "mimeType": "text/markdown"
             }
         }
+        
+        # Tool handlers by name
+        self._dispatch: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+            "get_housing_statistics": self._tool_housing_statistics,
+            "get_income_limits": self._tool_income_limits,
+            "get_public_notices": self._tool_public_notices,
+            "search_housing_data": self._tool_search_housing_data,
+            "check_eligibility": self._tool_check_eligibility,
+            "get_funding_details": self._tool_funding_details,
+            "search_notices": self._tool_search_notices,
+            "get_cache_stats": self._tool_cache_stats,
+        }
+        
+        # Tools and resources are static after construction, so build the
+        # list responses and resource texts once
+        self._tools_list_response = self._build_tools_list_response()
+        self._resources_list_response = self._build_resources_list_response()
+        self._housing_context_template = self._build_housing_context_template()
+        self._api_docs_text = self._build_api_documentation()
+        
+        # Rendered tool results are cached per (tool, arguments) for the TTL of
+        # the underlying data; get_cache_stats is never cached
+        self._response_cache_ttl_hours = {
+            "get_housing_statistics": settings.cache_ttl_hours,
+            "get_income_limits": settings.cache_ttl_income_limits,
+            "get_public_notices": settings.cache_ttl_notices,
+            "search_housing_data": settings.cache_ttl_notices,
+            "check_eligibility": settings.cache_ttl_income_limits,
+            "get_funding_details": settings.cache_ttl_hours,
+            "search_notices": settings.cache_ttl_notices,
+        }
+        self._response_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._redis = None
+        
+        # Use Redis for the response cache if configured
+        if settings.redis_url:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(settings.redis_url)
+                logger.info("Redis response cache initialized")
+            except ImportError:
+                logger.warning("Redis not available, using in-process response cache")
+            except Exception as e:
+                logger.warning("Failed to connect to Redis", error=str(e))
     
     async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle incoming MCP requests."""
@@ -268,6 +379,10 @@ class SMCHousingMCPServer:
     
     async def _handle_tools_list(self) -> Dict[str, Any]:
         """Handle tools list request."""
+        return self._tools_list_response
+    
+    def _build_tools_list_response(self) -> Dict[str, Any]:
+        """Build the tools list response."""
         tools_list = []
         for name, tool_def in self.tools.items():
             tools_list.append({
@@ -292,7 +407,22 @@ class SMCHousingMCPServer:
             return self._error_response(f"Unknown tool: {tool_name}")
         
         try:
-            result = await self._execute_tool(tool_name, arguments)
+            cache_key = self._response_cache_key(tool_name, arguments)
+            ttl_hours = self._response_cache_ttl_hours.get(tool_name)
+            
+            text = None
+            if ttl_hours and arguments.get("use_cache", True):
+                text = await self._get_cached_response(cache_key)
+            
+            if text is None:
+                result = await self._execute_tool(tool_name, arguments)
+                payload = orjson.dumps(
+                    result, default=json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
+                # Failed lookups are not kept around for the whole TTL
+                if ttl_hours and self._is_cacheable(tool_name, result):
+                    await self._set_cached_response(cache_key, payload, ttl_hours)
+                text = payload.decode()
             
             return {
                 "jsonrpc": "2.0",
@@ -300,7 +430,7 @@ class SMCHousingMCPServer:
                     "content": [
                         {
                             "type": "text",
-                            "text": json.dumps(result, indent=2, default=str)
+                            "text": text
                         }
                     ]
                 }
@@ -310,84 +440,189 @@ class SMCHousingMCPServer:
             logger.error("Tool execution failed", tool=tool_name, error=str(e))
             return self._error_response(f"Tool execution failed: {str(e)}")
     
-    async def _execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
-        """Execute a specific tool."""
-        if tool_name == "get_housing_statistics":
-            use_cache = arguments.get("use_cache", True)
-            stats = await dashboard_extractor.get_housing_statistics(use_cache=use_cache)
-            return stats.dict() if stats else None
-        
-        elif tool_name == "get_income_limits":
-            year = arguments.get("year")
-            family_size = arguments.get("family_size")
-            use_cache = arguments.get("use_cache", True)
-            limits = await income_limits_extractor.get_income_limits(
-                year=year, family_size=family_size, use_cache=use_cache
-            )
-            return [limit.dict() for limit in limits]
-        
-        elif tool_name == "get_public_notices":
-            limit = arguments.get("limit", 10)
-            date_range_days = arguments.get("date_range_days")
-            use_cache = arguments.get("use_cache", True)
-            notices = await public_notices_extractor.get_public_notices(
-                limit=limit, date_range_days=date_range_days, use_cache=use_cache
-            )
-            return [notice.dict() for notice in notices]
+    def _is_cacheable(self, tool_name: str, result: Any) -> bool:
+        """Whether a tool result is a successful one worth caching.
         
-        elif tool_name == "search_housing_data":
-            query = arguments["query"]
-            data_type = arguments.get("data_type", "all")
-            limit = arguments.get("limit", 10)
-            return await self._search_all_data(query, data_type, limit)
-        
-        elif tool_name == "check_eligibility":
-            annual_income = arguments["annual_income"]
-            family_size = arguments["family_size"]
-            ami_category = arguments.get("ami_category", "80%")
-            year = arguments.get("year", 2025)
-            return await income_limits_extractor.check_eligibility(
-                annual_income, family_size, ami_category, year
-            )
+        Extractors report failures as empty results, except check_eligibility,
+        whose error and missing-data answers are the ones without an
+        ``income_limit``.
+        """
+        if not result:
+            return False
+        if tool_name == "check_eligibility":
+            return "income_limit" in result
+        return True
+    
+    def _response_cache_key(self, tool_name: str, arguments: Dict[str, Any]) -> str:
+        """Build the response cache key for a tool call, ignoring ``use_cache``."""
+        key_args = {k: v for k, v in arguments.items() if k != "use_cache"}
+        digest = hashlib.blake2b(
+            orjson.dumps(key_args, default=str, option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).hexdigest()
+        return f"smcgov_housing:mcp:{tool_name}:{digest}"
+    
+    async def _get_cached_response(self, key: str) -> Optional[str]:
+        """Get a rendered tool result from Redis or the in-process cache."""
+        if self._redis is not None:
+            try:
+                cached = await self._redis.get(key)
+                if cached is not None:
+                    logger.debug("Response cache hit (Redis)", key=key)
+                    return cached.decode()
+                return None
+            except Exception as e:
+                logger.warning("Redis get failed", key=key, error=str(e))
         
-        elif tool_name == "get_funding_details":
-            use_cache = arguments.get("use_cache", True)
-            return await dashboard_extractor.get_funding_details()
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            del self._response_cache[key]
+            return None
+        self._response_cache.move_to_end(key)
+        logger.debug("Response cache hit (memory)", key=key)
+        return payload.decode()
+    
+    async def _set_cached_response(self, key: str, payload: bytes, ttl_hours: int):
+        """Store a rendered tool result in Redis or the in-process cache."""
+        ttl_seconds = int(ttl_hours * 3600)
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, payload, ex=ttl_seconds)
+                return
+            except Exception as e:
+                logger.warning("Redis set failed", key=key, error=str(e))
         
-        elif tool_name == "search_notices":
-            query = arguments["query"]
-            limit = arguments.get("limit", 10)
-            notices = await public_notices_extractor.search_notices(query, limit)
-            return [notice.dict() for notice in notices]
+        self._response_cache[key] = (time.monotonic() + ttl_seconds, payload)
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+            self._response_cache.popitem(last=False)
+    
+    async def _execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Execute a tool, sharing one in-flight call among identical concurrent requests.
         
-        elif tool_name == "get_cache_stats":
-            return await cache_manager.get_cache_stats()
+        The call runs as its own task, and every caller (the first included)
+        waits on it through a shield, so a cancelled caller never cancels the
+        call for the others.
+        """
+        key = tool_name + ":" + orjson.dumps(arguments, default=str, option=orjson.OPT_SORT_KEYS).decode()
         
-        else:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run_tool(tool_name, arguments))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight_done(key, done))
+        return await asyncio.shield(task)
+    
+    def _inflight_done(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished shared call."""
+        del self._inflight[key]
+        # Mark any exception as retrieved, in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    async def _run_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Execute a specific tool."""
+        handler = self._dispatch.get(tool_name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {tool_name}")
+        return await handler(arguments)
+    
+    async def _tool_housing_statistics(self, arguments: Dict[str, Any]) -> Any:
+        """Handle the get_housing_statistics tool."""
+        use_cache = arguments.get("use_cache", True)
+        stats = await dashboard_extractor.get_housing_statistics(use_cache=use_cache)
+        return stats
+    
+    async def _tool_income_limits(self, arguments: Dict[str, Any]) -> Any:
+        """Handle the get_income_limits tool."""
+        year = arguments.get("year")
+        family_size = arguments.get("family_size")
+        use_cache = arguments.get("use_cache", True)
+        limits = await income_limits_extractor.get_income_limits(
+            year=year, family_size=family_size, use_cache=use_cache
+        )
+        return limits
+    
+    async def _tool_public_notices(self, arguments: Dict[str, Any]) -> Any:
+        """Handle the get_public_notices tool."""
+        limit = arguments.get("limit", 10)
+        date_range_days = arguments.get("date_range_days")
+        use_cache = arguments.get("use_cache", True)
+        return await public_notices_extractor.get_public_notices(
+            limit=limit, date_range_days=date_range_days, use_cache=use_cache
+        )
+    
+    async def _tool_search_housing_data(self, arguments: Dict[str, Any]) -> Any:
+        """Handle the search_housing_data tool."""
+        query = arguments["query"]
+        data_type = arguments.get("data_type", "all")
+        limit = arguments.get("limit", 10)
+        return await self._search_all_data(query, data_type, limit)
+    
+    async def _tool_check_eligibility(self, arguments: Dict[str, Any]) -> Any:
+        """Handle the check_eligibility tool."""
+        annual_income = arguments["annual_income"]
+        family_size = arguments["family_size"]
+        ami_category = arguments.get("ami_category", "80%")
+        year = arguments.get("year", 2025)
+        return await income_limits_extractor.check_eligibility(
+            annual_income, family_size, ami_category, year
+        )
+    
+    async def _tool_funding_details(self, arguments: Dict[str, Any]) -> Any:
+        """Handle the get_funding_details tool."""
+        return await dashboard_extractor.get_funding_details()
+    
+    async def _tool_search_notices(self, arguments: Dict[str, Any]) -> Any:
+        """Handle the search_notices tool."""
+        query = arguments["query"]
+        limit = arguments.get("limit", 10)
+        return await public_notices_extractor.search_notices(query, limit)
+    
+    async def _tool_cache_stats(self, arguments: Dict[str, Any]) -> Any:
+        """Handle the get_cache_stats tool."""
+        return await cache_manager.get_cache_stats()
     
     async def _search_all_data(self, query: str, data_type: str, limit: int) -> List[Dict[str, Any]]:
         """Search across all data sources."""
         results = []
         
         try:
-            if data_type in ["all", "notices"]:
-                notices = await public_notices_extractor.search_notices(query, limit)
-                for notice in notices:
-                    results.append({
-                        "type": "notice",
-                        "data": notice.dict(),
-                        "relevance": "high"
-                    })
+            notices, stats = None, None
             
-            if data_type in ["all", "statistics"] and len(results) < limit:
+            if data_type == "all":
+                # Independent scrapes, so run them concurrently
+                notices, stats = await asyncio.gather(
+                    public_notices_extractor.search_notices(query, limit),
+                    dashboard_extractor.get_housing_statistics(),
+                    return_exceptions=True
+                )
+                if isinstance(notices, Exception):
+                    logger.warning("Notice search failed", query=query, error=str(notices))
+                    notices = None
+                if isinstance(stats, Exception):
+                    logger.warning("Statistics lookup failed", query=query, error=str(stats))
+                    stats = None
+            elif data_type == "notices":
+                notices = await public_notices_extractor.search_notices(query, limit)
+            elif data_type == "statistics":
                 stats = await dashboard_extractor.get_housing_statistics()
-                if stats and query.lower() in str(stats.dict()).lower():
-                    results.append({
-                        "type": "statistics",
-                        "data": stats.dict(),
-                        "relevance": "medium"
-                    })
+            
+            for notice in notices or []:
+                results.append({
+                    "type": "notice",
+                    "data": notice,
+                    "relevance": "high"
+                })
+            
+            if stats and len(results) < limit and query.lower() in str(stats.dict()).lower():
+                results.append({
+                    "type": "statistics",
+                    "data": stats,
+                    "relevance": "medium"
+                })
             
             return results[:limit]
             
@@ -397,6 +632,10 @@ class SMCHousingMCPServer:
     
     async def _handle_resources_list(self) -> Dict[str, Any]:
         """Handle resources list request."""
+        return self._resources_list_response
+    
+    def _build_resources_list_response(self) -> Dict[str, Any]:
+        """Build the resources list response."""
         resources_list = []
         for name, resource_def in self.resources.items():
             resources_list.append({
@@ -439,6 +678,10 @@ class SMCHousingMCPServer:
     
     async def _get_housing_context(self) -> str:
         """Get comprehensive housing context."""
+        return self._housing_context_template.format_map({"timestamp": now_iso()})
+    
+    def _build_housing_context_template(self) -> str:
+        """Build the housing context text with a ``{timestamp}`` placeholder."""
         context = f"""
 San Mateo County Department of Housing - Data Context
 
@@ -472,12 +715,16 @@ Data is updated regularly and cached for performance. Use the available tools
 to access specific information or search across all data sources.
 
 Server: {self.server_info['name']} v{self.server_info['version']}
-Last updated: {datetime.now().isoformat()}
+Last updated: {{timestamp}}
         """
         return context.strip()
     
     async def _get_api_documentation(self) -> str:
         """Get API documentation."""
+        return self._api_docs_text
+    
+    def _build_api_documentation(self) -> str:
+        """Build API documentation from the tool definitions."""
         doc = "# San Mateo County Housing MCP Server API\n\n"
         doc += "## Available Tools\n\n"
         
@@ -508,20 +755,24 @@ Last updated: {datetime.now().isoformat()}
         """Run the MCP server."""
         logger.info("Starting SMC Housing MCP Server", version=settings.server_version)
         
+        outbound: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+        writer = asyncio.create_task(self._stdout_writer(outbound))
+        
         try:
+            readline = await self._stdin_line_reader()
+            
             # Read from stdin and write to stdout for MCP protocol
             while True:
-                line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
+                line = await readline()
                 if not line:
                     break
                 
                 try:
                     request = json.loads(line.strip())
                     response = await self.handle_request(request)
-                    print(json.dumps(response))
-                    sys.stdout.flush()
+                    outbound.put_nowait(orjson.dumps(response, default=str) + b"\n")
                 except json.JSONDecodeError:
-                    logger.warning("Invalid JSON received", line=line.strip())
+                    logger.warning("Invalid JSON received", line=line.strip().decode(errors="replace"))
                 except Exception as e:
                     logger.error("Error processing request", error=str(e))
                     
@@ -530,28 +781,125 @@ Last updated: {datetime.now().isoformat()}
         except Exception as e:
             logger.error("Server error", error=str(e))
         finally:
+            outbound.put_nowait(None)
+            await writer
             await self._cleanup()
     
+    async def warm(self):
+        """Pre-load the dashboard, income limits and notices caches."""
+        results = await asyncio.gather(
+            dashboard_extractor.get_housing_statistics(),
+            income_limits_extractor.get_income_limits(year=2025),
+            public_notices_extractor.get_public_notices(limit=10),
+            return_exceptions=True
+        )
+        
+        for name, result in zip(("statistics", "income_limits", "notices"), results):
+            if isinstance(result, Exception):
+                logger.warning("Cache warm-up failed", source=name, error=str(result))
+        
+        logger.info("Cache warm-up completed")
+    
+    async def _stdin_line_reader(self) -> Callable[[], Awaitable[bytes]]:
+        """Return a coroutine function that reads one line from stdin.
+        
+        stdin is attached to the event loop as a non-blocking pipe when it is
+        a pipe or socket; anything else (stdin redirected from a regular file
+        or a device) is read in a thread pool. uvloop aborts the process
+        rather than raising when given such a file, so the check is made up
+        front instead of relying on connect_read_pipe to refuse it.
+        """
+        loop = asyncio.get_running_loop()
+        threaded = lambda: loop.run_in_executor(None, sys.stdin.buffer.readline)
+        try:
+            mode = os.fstat(sys.stdin.fileno()).st_mode
+        except (OSError, ValueError) as e:
+            logger.info("Falling back to threaded stdin reads", error=str(e))
+            return threaded
+        if not (stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)):
+            logger.info("Falling back to threaded stdin reads", reason="stdin is not a pipe")
+            return threaded
+        
+        reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+        protocol = asyncio.StreamReaderProtocol(reader)
+        try:
+            await loop.connect_read_pipe(lambda: protocol, sys.stdin)
+            return reader.readline
+        except (ValueError, NotImplementedError, OSError) as e:
+            logger.info("Falling back to threaded stdin reads", error=str(e))
+            return threaded
+    
+    async def _stdout_writer(self, outbound: "asyncio.Queue[Optional[bytes]]"):
+        """Write queued responses to stdout, one write and flush per batch.
+        
+        Whatever is queued by the time the writer runs is joined into a single
+        write (up to STDOUT_BATCH_MAX_BYTES); a None item ends the writer after
+        the pending responses are flushed.
+        """
+        done = False
+        while not done:
+            batch = [await outbound.get()]
+            if batch[0] is None:
+                break
+            
+            # Let responses finishing in the same loop iteration join the batch
+            await asyncio.sleep(0)
+            size = len(batch[0])
+            while size < STDOUT_BATCH_MAX_BYTES:
+                try:
+                    chunk = outbound.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if chunk is None:
+                    done = True
+                    break
+                batch.append(chunk)
+                size += len(chunk)
+            
+            try:
+                sys.stdout.buffer.write(b"".join(batch))
+                sys.stdout.buffer.flush()
+            except Exception as e:
+                logger.error("Failed to write responses", error=str(e))
+    
     async def _cleanup(self):
         """Clean up resources."""
         logger.info("Cleaning up resources")
         try:
             # Clean up extractors
             income_limits_extractor.cleanup()
+            await scraper.close()
             
             # Clean up cache if needed
             # await cache_manager.clear()
             
+            if self._redis is not None:
+                await self._redis.aclose()
+            
         except Exception as e:
             logger.warning("Cleanup error", error=str(e))
 
 
+def use_uvloop():
+    """Use uvloop's faster event loop when it is installed."""
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+
 async def main():
     """Main entry point."""
-    server = SMCHousingMCPServer()
-    await server.run()
+    from server_instance import mcp_server
+    await mcp_server.run()
 
 
 if __name__ == "__main__":
+    # Let server_instance import this module as "server" instead of
+    # executing it a second time
+    sys.modules.setdefault("server", sys.modules[__name__])
+    
+    use_uvloop()
     asyncio.run(main())
 
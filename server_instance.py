@@ -0,0 +1,10 @@
+"""Shared SMC Housing MCP Server instance.
+
+Both the stdio server and the SSE wrapper use this instance, so the tool and
+resource tables and their derived caches are built once per process.
+"""
+
+from server import SMCHousingMCPServer
+
+# Global MCP server instance
+mcp_server = SMCHousingMCPServer()
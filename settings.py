@@ -1,12 +1,17 @@
 """Configuration settings for the SMC Housing MCP Server."""
 
 import os
+from dataclasses import dataclass
 from typing import Optional
-from pydantic import BaseModel
 
 
-class Settings(BaseModel):
-    """Application settings."""
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application settings.
+    
+    Read from the environment once at import; a frozen, slotted dataclass keeps
+    attribute access cheap on the request path.
+    """
     
     # Server configuration
     server_name: str = "smcgov-housing-mcp"
@@ -18,10 +23,14 @@ class Settings(BaseModel):
     cache_ttl_notices: int = 6
     
     # Web scraping configuration
+    # Headless browser for dynamic pages (Playwright; names kept for existing env vars)
     selenium_headless: bool = True
+    selenium_pool_size: int = 2
     request_timeout: int = 30
     request_delay: float = 1.0
     max_retries: int = 3
+    per_host_concurrency: int = 4
+    http_cache_ttl_seconds: int = 3600
     
     # User agent for requests
     user_agent: str = "SMC Housing MCP Server/1.0.0"
@@ -41,9 +50,12 @@ settings = Settings(
     cache_ttl_income_limits=int(os.getenv("SMC_HOUSING_CACHE_TTL_INCOME_LIMITS", "720")),
     cache_ttl_notices=int(os.getenv("SMC_HOUSING_CACHE_TTL_NOTICES", "6")),
     selenium_headless=os.getenv("SMC_HOUSING_SELENIUM_HEADLESS", "true").lower() == "true",
+    selenium_pool_size=int(os.getenv("SMC_HOUSING_SELENIUM_POOL_SIZE", "2")),
     request_timeout=int(os.getenv("SMC_HOUSING_REQUEST_TIMEOUT", "30")),
     request_delay=float(os.getenv("SMC_HOUSING_REQUEST_DELAY", "1.0")),
     max_retries=int(os.getenv("SMC_HOUSING_MAX_RETRIES", "3")),
+    per_host_concurrency=int(os.getenv("SMC_HOUSING_PER_HOST_CONCURRENCY", "4")),
+    http_cache_ttl_seconds=int(os.getenv("SMC_HOUSING_HTTP_CACHE_TTL", "3600")),
     user_agent=os.getenv("SMC_HOUSING_USER_AGENT", "SMC Housing MCP Server/1.0.0"),
     redis_url=os.getenv("SMC_HOUSING_REDIS_URL"),
     log_level=os.getenv("SMC_HOUSING_LOG_LEVEL", "INFO")
@@ -1,19 +1,26 @@
 """SSE wrapper for San Mateo County Housing MCP Server."""
 
 import asyncio
-import json
 import uuid
 from datetime import datetime
 from typing import AsyncGenerator, Dict, Any
+import orjson
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import StreamingResponse
-from fastapi.middleware.cors import CORSMiddleware
 import structlog
 
 # Import our MCP server - handle import gracefully
 try:
-    from server import SMCHousingMCPServer
+    from server import json_default, now_iso
+    from server_instance import mcp_server
+    from extractors.notices import public_notices_extractor
 except ImportError:
+    json_default = str
+    public_notices_extractor = None
+    
+    def now_iso():
+        return datetime.now().isoformat()
+    
     # Create a minimal MCP server for testing
     class SMCHousingMCPServer:
         def __init__(self):
@@ -31,6 +38,11 @@ except ImportError:
         
         async def _handle_resources_list(self):
             return {"result": {"resources": []}}
+        
+        async def warm(self):
+            pass
+    
+    mcp_server = SMCHousingMCPServer()
 
 logger = structlog.get_logger()
 
@@ -40,48 +52,82 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# CORS headers are the same for every response, so they are precomputed
+_CORS_HEADERS_RAW = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", b"*"),
+    (b"access-control-allow-headers", b"*"),
+]
+
+class StaticCORSMiddleware:
+    """Add fixed CORS headers to every HTTP response.
+    
+    The server allows all origins, so there is no per-request origin matching;
+    preflight requests are answered directly.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        if scope["method"] == "OPTIONS" and any(
+            name == b"access-control-request-method" for name, _ in scope["headers"]
+        ):
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": _CORS_HEADERS_RAW + [(b"content-length", b"0")]
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + _CORS_HEADERS_RAW
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
+
 # Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(StaticCORSMiddleware)
 
-# Global MCP server instance
-mcp_server = SMCHousingMCPServer()
+# Strong references to fire-and-forget startup tasks
+_background_tasks = set()
+
+# Keepalive events are pre-serialized around the timestamp, equivalent to
+# SSEFormatter.format_event("keepalive", {"timestamp": ...})
+KEEPALIVE_PREFIX = b'event: keepalive\ndata: {"timestamp":"'
+KEEPALIVE_SUFFIX = b'"}\n\n'
 
 class SSEFormatter:
     """Format messages for Server-Sent Events."""
     
     @staticmethod
-    def format_event(event_type: str, data: Any, event_id: str = None) -> str:
+    def format_event(event_type: str, data: Any, event_id: str = None) -> bytes:
         """Format data as SSE event."""
-        lines = []
-        
+        head = b"event: " + event_type.encode() + b"\n"
         if event_id:
-            lines.append(f"id: {event_id}")
-        
-        lines.append(f"event: {event_type}")
+            head = b"id: " + event_id.encode() + b"\n" + head
         
         if isinstance(data, (dict, list)):
-            data = json.dumps(data, default=str)
+            # Compact JSON never contains raw newlines, so it is a single data line
+            return head + b"data: " + orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS) + b"\n\n"
         
         # Split data into multiple lines if needed
-        for line in str(data).split('\n'):
-            lines.append(f"data: {line}")
-        
-        lines.append("")  # Empty line to end event
-        return "\n".join(lines) + "\n"
+        body = b"".join(b"data: " + line.encode() + b"\n" for line in str(data).split('\n'))
+        return head + body + b"\n"
 
-async def sse_generator(request: Request) -> AsyncGenerator[str, None]:
+async def sse_generator(request: Request) -> AsyncGenerator[bytes, None]:
     """Generate SSE events for MCP communication."""
     try:
         # Send initial connection event
         yield SSEFormatter.format_event("connected", {
             "message": "Connected to SMC Housing MCP Server",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "server_info": mcp_server.server_info
         })
         
@@ -104,9 +150,7 @@ async def sse_generator(request: Request) -> AsyncGenerator[str, None]:
                 break
             
             # Send keepalive every 30 seconds
-            yield SSEFormatter.format_event("keepalive", {
-                "timestamp": datetime.now().isoformat()
-            })
+            yield KEEPALIVE_PREFIX + now_iso().encode() + KEEPALIVE_SUFFIX
             
             await asyncio.sleep(30)
             
@@ -114,9 +158,16 @@ async def sse_generator(request: Request) -> AsyncGenerator[str, None]:
         logger.error("SSE generator error", error=str(e))
         yield SSEFormatter.format_event("error", {
             "message": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         })
 
+@app.on_event("startup")
+async def start_background_tasks():
+    """Warm the data caches in the background."""
+    task = asyncio.create_task(mcp_server.warm())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
 @app.get("/")
 async def root():
     """Root endpoint with server information."""
@@ -128,7 +179,8 @@ async def root():
             "/sse": "Server-Sent Events endpoint for MCP communication",
             "/tools": "Get available MCP tools",
             "/resources": "Get available MCP resources",
-            "/call/{tool_name}": "Call a specific MCP tool"
+            "/call/{tool_name}": "Call a specific MCP tool",
+            "/call/{tool_name}/stream": "Call a specific MCP tool, streaming results as JSON lines"
         },
         "server_info": mcp_server.server_info
     }
@@ -142,8 +194,6 @@ async def sse_endpoint(request: Request):
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "*",
         }
     )
 
@@ -179,6 +229,57 @@ async def call_tool(tool_name: str, request: Request):
         logger.error("Tool call error", tool=tool_name, error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+async def tool_stream_generator(tool_name: str, arguments: Dict[str, Any]) -> AsyncGenerator[bytes, None]:
+    """Generate JSON lines for a tool call.
+    
+    Every tool uses the same format: list results are written one item per
+    line, any other result as a single line, and a failure as one
+    ``{"error": ...}`` line. get_public_notices streams each notice as it is
+    parsed, in page order rather than newest first; other tools go through
+    the normal (response cached) tool call and are written once it returns.
+    """
+    try:
+        if tool_name == "get_public_notices" and public_notices_extractor is not None:
+            async for notice in public_notices_extractor.stream_notices(
+                limit=arguments.get("limit", 10),
+                date_range_days=arguments.get("date_range_days"),
+                use_cache=arguments.get("use_cache", True)
+            ):
+                yield orjson.dumps(notice.dict(), default=json_default) + b"\n"
+            return
+        
+        response = await mcp_server._handle_tool_call({
+            "name": tool_name,
+            "arguments": arguments
+        })
+        if "error" in response:
+            yield orjson.dumps({"error": response["error"]["message"]}) + b"\n"
+            return
+        
+        result = orjson.loads(response["result"]["content"][0]["text"])
+        items = result if isinstance(result, list) else [result]
+        for item in items:
+            yield orjson.dumps(item) + b"\n"
+        
+    except Exception as e:
+        logger.error("Tool stream error", tool=tool_name, error=str(e))
+        yield orjson.dumps({"error": str(e)}) + b"\n"
+
+@app.post("/call/{tool_name}/stream")
+async def call_tool_stream(tool_name: str, request: Request):
+    """Call a specific MCP tool and stream its results as JSON lines."""
+    try:
+        body = await request.json()
+        arguments = body.get("arguments", {})
+    except Exception as e:
+        logger.error("Tool stream request error", tool=tool_name, error=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        tool_stream_generator(tool_name, arguments),
+        media_type="application/x-ndjson"
+    )
+
 @app.post("/mcp")
 async def mcp_endpoint(request: Request):
     """General MCP endpoint for JSON-RPC requests."""
@@ -197,7 +298,7 @@ async def health_check():
     try:
         return {
             "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "server_info": mcp_server.server_info,
             "version": "1.0.0"
         }
@@ -205,7 +306,7 @@ async def health_check():
         return {
             "status": "unhealthy",
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
 
 if __name__ == "__main__":
@@ -218,5 +319,7 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=port,
+        loop="uvloop",  # uvloop and httptools come with uvicorn[standard]
+        http="httptools",
         log_level="info"
     )
\ No newline at end of file
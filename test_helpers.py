@@ -0,0 +1,98 @@
+"""Shared plumbing for the SMC Housing MCP Server test scripts."""
+
+import asyncio
+import sys
+from typing import Any, Awaitable, Callable, Dict
+
+import orjson
+
+from server import SMCHousingMCPServer, json_default, use_uvloop
+
+
+# Results by test step, written out together once the run finishes
+RESULTS: Dict[str, Any] = {}
+
+
+def write_results():
+    """Write every collected result as one indented JSON document."""
+    sys.stdout.write(
+        orjson.dumps(RESULTS, default=json_default, option=orjson.OPT_INDENT_2).decode() + "\n"
+    )
+
+
+def _failed(response: Any) -> bool:
+    """Whether a recorded response is an exception or a JSON-RPC error."""
+    return isinstance(response, dict) and ("exception" in response or "error" in response)
+
+
+async def run_cases(server, cases):
+    """Send independent requests concurrently and record their responses.
+
+    Each case is a (label, request) tuple. One summary line is printed once
+    every response is in.
+    """
+    responses = await asyncio.gather(
+        *(server.handle_request(request) for _, request in cases),
+        return_exceptions=True
+    )
+    failed = []
+    for (label, _), response in zip(cases, responses):
+        if isinstance(response, BaseException):
+            response = {"exception": repr(response)}
+        RESULTS[label] = response
+        if _failed(response):
+            failed.append(label)
+
+    summary = f"{len(cases) - len(failed)}/{len(cases)} cases returned a result"
+    print(summary + (f"; errors: {', '.join(failed)}" if failed else ""))
+
+
+# Tests share the process-wide server instance; set once a test has used it
+_SERVER_USED = False
+
+
+def get_server() -> SMCHousingMCPServer:
+    """Get the shared server instance."""
+    global _SERVER_USED
+    from server_instance import mcp_server
+    _SERVER_USED = True
+    return mcp_server
+
+
+async def close_server():
+    """Clean up the shared server once all tests have run."""
+    global _SERVER_USED
+    if _SERVER_USED:
+        from server_instance import mcp_server
+        await mcp_server._cleanup()
+        _SERVER_USED = False
+
+
+async def _run_all(tests):
+    """Run every test on one event loop and shared server."""
+    try:
+        for test in tests:
+            await test()
+    finally:
+        write_results()
+        await close_server()
+
+
+def run_suite(title: str, *tests: Callable[[], Awaitable[None]]):
+    """Print a banner and run the given tests.
+
+    A failing test is reported and makes the script exit with status 1.
+    """
+    print(title)
+    print("=" * 60)
+
+    use_uvloop()
+    try:
+        asyncio.run(_run_all(tests))
+    except KeyboardInterrupt:
+        print("\nTest interrupted by user")
+    except Exception as e:
+        print(f"\nTest failed with error: {e!r}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -1,11 +1,15 @@
 """URL configuration for San Mateo County Housing website."""
 
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional
+
 # Base URLs
 BASE_URL = "https://www.smcgov.org"
 HOUSING_BASE = f"{BASE_URL}/housing"
 
 # Main sections
-URLS = {
+URLS = MappingProxyType({
     "housing_home": HOUSING_BASE,
     "dashboards": f"{HOUSING_BASE}/doh-dashboards",
     "income_limits": f"{HOUSING_BASE}/income-limits-and-rent-payments",
@@ -20,31 +24,36 @@ URLS = {
     "tenant_rights": f"{HOUSING_BASE}/tenants-protections-and-rights",
     "hcdc": f"{HOUSING_BASE}/housing-community-development-committee-hcdc",
     "voucher_briefings": f"{HOUSING_BASE}/housing-authority-voucher-program-briefings"
-}
+})
 
-# Income limits PDF patterns
-INCOME_LIMITS_PDFS = {
-    "2025": f"{HOUSING_BASE}/sites/smcgov.org/files/2025%20Income%20%26%20Rent%20Limits.pdf",
-    "2024": f"{HOUSING_BASE}/sites/smcgov.org/files/2024%20Income%20%26%20Rent%20Limits.pdf",
-    "2023": f"{HOUSING_BASE}/sites/smcgov.org/files/2023%20Income%20%26%20Rent%20Limits.pdf"
-}
+# Income limits PDFs by year, most recent first
+INCOME_LIMITS_PDFS = MappingProxyType({
+    year: f"{HOUSING_BASE}/sites/smcgov.org/files/{year}%20Income%20%26%20Rent%20Limits.pdf"
+    for year in (2025, 2024, 2023)
+})
 
 # Dashboard selectors (for web scraping)
-DASHBOARD_SELECTORS = {
+DASHBOARD_SELECTORS = MappingProxyType({
     "total_units": "[data-testid='total-affordable-units']",
     "total_projects": "[data-testid='total-projects']",
     "county_funding": "[data-testid='county-funding']",
     "federal_funding": "[data-testid='federal-funding']",
     "units_status_chart": "[data-testid='units-status-chart']",
     "units_by_city_chart": "[data-testid='units-by-city-chart']"
-}
+})
 
 # Common CSS selectors
-SELECTORS = {
+SELECTORS = MappingProxyType({
     "notice_links": "a[href*='notice']",
     "pdf_links": "a[href$='.pdf']",
     "content_main": ".main-content",
     "page_title": "h1",
     "breadcrumb": ".breadcrumb"
-}
+})
+
+
+@lru_cache(maxsize=None)
+def income_limits_url(year: int) -> Optional[str]:
+    """Get the income limits PDF URL for a year, if one is published."""
+    return INCOME_LIMITS_PDFS.get(year)
 
@@ -1,167 +1,470 @@
 """Web scraping utilities for the MCP server."""
 
 import asyncio
+import importlib.util
+import sys
 import time
-from typing import Optional, Dict, Any, List
-import requests
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+from typing import AsyncIterator, Literal, Mapping, Optional, Dict, Any, List, Tuple, Union
+import aiohttp
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+from tenacity import (
+    RetryCallState, retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+)
 import structlog
 
 from config.settings import settings
+from config.urls import DASHBOARD_SELECTORS, SELECTORS
+from utils.http_cache import file_key, http_cache
+from processors.cache_manager import cache_manager
+from processors.cache_keys import scrape_key, ttl_hours
+
+# Playwright is optional; without it dynamic pages are fetched over plain HTTP
+try:
+    from playwright.async_api import Error as PlaywrightError
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    from playwright.async_api import async_playwright
+    _HAS_PLAYWRIGHT = True
+except ImportError:
+    _HAS_PLAYWRIGHT = False
 
 logger = structlog.get_logger()
 
+# aiohttp only decodes brotli responses when a brotli package is installed
+_HAS_BROTLI = any(
+    importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi")
+)
+
+# Resource types a rendered page never needs for DOM extraction
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# A parsed page: BeautifulSoup, or an lxml element from the fast path
+ParsedPage = Union[BeautifulSoup, lxml_html.HtmlElement]
+
+# How extract_bundle reads a selector: first text, all texts, or link URLs
+ExtractMode = Literal["one", "all", "links"]
+
+
+@lru_cache(maxsize=256)
+def _css(selector: str) -> CSSSelector:
+    """Compile a CSS selector to an lxml XPath matcher, once per selector."""
+    return CSSSelector(selector)
+
+
+# Selectors from config.urls, compiled once at import
+_COMPILED_SELECTORS = {
+    key: _css(selector) for key, selector in {**DASHBOARD_SELECTORS, **SELECTORS}.items()
+}
+
+
+# Responses worth retrying; other HTTP errors fail immediately
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Check whether a failed request should be retried."""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status in _RETRY_STATUSES
+    return isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """Log a failed attempt before tenacity backs off."""
+    logger.warning(
+        "Request attempt failed",
+        attempt=retry_state.attempt_number,
+        max_retries=settings.max_retries,
+        error=str(retry_state.outcome.exception())
+    )
+
+
+# Exponential backoff with jitter for transient network and server errors
+_retry_transient = retry(
+    stop=stop_after_attempt(settings.max_retries),
+    wait=wait_exponential_jitter(initial=0.5, max=16),
+    retry=retry_if_exception(_is_transient),
+    before_sleep=_log_retry,
+    reraise=True
+)
+
+
+def _element_text(element: lxml_html.HtmlElement) -> str:
+    """Get an element's text the way BeautifulSoup's get_text(strip=True) does."""
+    return "".join(text.strip() for text in element.itertext())
+
 
 class WebScraper:
     """Web scraping utility class."""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': settings.user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': 'gzip, deflate, br' if _HAS_BROTLI else 'gzip, deflate',
             'Connection': 'keep-alive',
-        })
-        self._driver = None
+        }
+        self._aio: Optional[aiohttp.ClientSession] = None
+        # Politeness is enforced per origin, so different hosts do not wait
+        # on each other: each host has a bounded number of slots, and request
+        # starts are spaced request_delay apart under the host's pacing lock
+        self._host_slots: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(settings.per_host_concurrency)
+        )
+        self._host_pacing: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._host_last_start: Dict[str, float] = {}
+        # One headless browser context is started on first use and shared;
+        # settings.selenium_pool_size pages may render in it at once
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._browser_lock = asyncio.Lock()
+        # Set when the browser fails to launch, e.g. Chromium not installed
+        self._browser_unavailable = False
+        self._page_slots = asyncio.Semaphore(settings.selenium_pool_size)
     
-    async def get_page_content(self, url: str, use_selenium: bool = False) -> Optional[str]:
-        """Get page content using requests or Selenium."""
+    async def get_page_content(self, url: str, use_selenium: bool = False,
+                               use_cache: bool = True) -> Optional[str]:
+        """Get page content over HTTP, or rendered in a browser with use_selenium.
+        
+        With ``use_cache=False`` the scraped-page cache is skipped and any
+        stored HTTP response is revalidated with the server before use.
+        """
         try:
+            if use_selenium and not _HAS_PLAYWRIGHT:
+                # Reported once, the same way a failed browser launch is
+                if not self._browser_unavailable:
+                    logger.warning("Playwright not available, falling back to requests")
+                    self._browser_unavailable = True
+                use_selenium = False
+            elif self._browser_unavailable:
+                use_selenium = False
+            
+            cache_key = scrape_key(url, "rendered") if use_selenium else scrape_key(url)
+            if use_cache:
+                cached_content = await cache_manager.get(cache_key)
+                if cached_content:
+                    return cached_content
+            
             if use_selenium:
-                return await self._get_content_selenium(url)
+                content = await self._get_content_rendered(url, use_cache=use_cache)
             else:
-                return await self._get_content_requests(url)
+                content = await self._get_content_requests(url, use_cache)
+            
+            if content:
+                await cache_manager.set(cache_key, content, ttl_hours=ttl_hours("scrape"))
+            return content
         except Exception as e:
             logger.error("Failed to get page content", url=url, error=str(e))
             return None
     
-    async def _get_content_requests(self, url: str) -> Optional[str]:
-        """Get page content using requests."""
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared aiohttp session on first use."""
+        if self._aio is None or self._aio.closed:
+            # Nearly every URL is on www.smcgov.org: keep connections and DNS
+            # answers around so repeat requests skip the lookup and TLS handshake
+            connector = aiohttp.TCPConnector(
+                limit_per_host=8,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+            self._aio = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=settings.request_timeout)
+            )
+        return self._aio
+    
+    async def _get_content_requests(self, url: str, use_cache: bool = True) -> Optional[str]:
+        """Get page content over plain HTTP."""
         try:
-            await asyncio.sleep(settings.request_delay)
-            response = self.session.get(url, timeout=settings.request_timeout)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
+            return await self._fetch_text(url, revalidate=not use_cache)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error("Request failed", url=url, error=str(e))
             return None
     
-    async def _get_content_selenium(self, url: str) -> Optional[str]:
-        """Get page content using Selenium for dynamic content."""
-        driver = None
+    async def _pace(self, netloc: str) -> None:
+        """Wait until request_delay has passed since the host's last request."""
+        async with self._host_pacing[netloc]:
+            last = self._host_last_start.get(netloc)
+            if last is not None:
+                remaining = last + settings.request_delay - time.monotonic()
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+            self._host_last_start[netloc] = time.monotonic()
+    
+    @_retry_transient
+    async def _fetch_text(self, url: str, revalidate: bool = False) -> str:
+        """Fetch a page body, retrying transient failures.
+        
+        A fresh cached response is served without a request unless
+        ``revalidate`` is set.
+        """
+        cached = await http_cache.get(url)
+        if cached and cached.fresh and not revalidate:
+            return cached.text
+        
+        session = await self._ensure_session()
+        netloc = urlparse(url).netloc
+        async with self._host_slots[netloc]:
+            await self._pace(netloc)
+            headers = cached.validators() if cached else None
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    await http_cache.refresh(url, response.headers)
+                    return cached.text
+                response.raise_for_status()
+                body = await response.read()
+                encoding = response.get_encoding()
+                await http_cache.store(url, body, encoding, response.headers)
+                return body.decode(encoding)
+    
+    async def _get_content_rendered(self, url: str,
+                                    wait_for: str = DASHBOARD_SELECTORS["units_status_chart"],
+                                    use_cache: bool = True) -> Optional[str]:
+        """Get page content rendered by a headless browser for dynamic content.
+        
+        Falls back to plain HTTP when no browser can be launched.
+        """
+        if not _HAS_PLAYWRIGHT or await self._ensure_browser() is None:
+            return await self._get_content_requests(url, use_cache)
+        
         try:
-            driver = self._get_driver()
-            driver.get(url)
-            
-            # Wait for page to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Additional wait for dynamic content
-            await asyncio.sleep(3)
-            
-            return driver.page_source
-        except (TimeoutException, WebDriverException) as e:
-            logger.error("Selenium failed", url=url, error=str(e))
+            return await self.get_rendered(url, wait_for)
+        except PlaywrightError as e:
+            logger.error("Browser render failed", url=url, error=str(e))
             return None
-        finally:
-            if driver:
-                driver.quit()
-    
-    def _get_driver(self) -> webdriver.Chrome:
-        """Create and configure Chrome driver."""
-        options = Options()
-        if settings.selenium_headless:
-            options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument(f'--user-agent={settings.user_agent}')
+    
+    async def get_rendered(self, url: str,
+                           wait_for: str = DASHBOARD_SELECTORS["units_status_chart"]) -> str:
+        """Render a page in the shared browser context and return its HTML.
+        
+        Images, fonts, media and stylesheets are not fetched. Instead of a
+        fixed sleep, the page is considered rendered once ``wait_for`` is
+        attached; if it never appears the HTML is returned as loaded so far.
+        """
+        context = await self._ensure_browser()
+        if context is None:
+            raise RuntimeError("Headless browser is not available")
+        async with self._page_slots:
+            page = await context.new_page()
+            try:
+                await page.goto(url, wait_until="domcontentloaded",
+                                timeout=settings.request_timeout * 1000)
+                try:
+                    await page.wait_for_selector(wait_for, state="attached", timeout=10_000)
+                except PlaywrightTimeoutError:
+                    logger.warning("Timed out waiting for dynamic content", url=url, selector=wait_for)
+                return await page.content()
+            finally:
+                await page.close()
+    
+    async def _ensure_browser(self):
+        """Launch the headless browser and its shared context on first use.
+        
+        Returns None if the browser cannot be launched; the failure is
+        logged once and later calls do not retry the launch.
+        """
+        async with self._browser_lock:
+            if self._context is None and not self._browser_unavailable:
+                playwright = await async_playwright().start()
+                try:
+                    browser = await playwright.chromium.launch(headless=settings.selenium_headless)
+                    context = await browser.new_context(user_agent=settings.user_agent)
+                    await context.route("**/*", self._filter_route)
+                except PlaywrightError as e:
+                    await playwright.stop()
+                    self._browser_unavailable = True
+                    logger.warning("Headless browser unavailable, falling back to requests",
+                                   error=str(e).splitlines()[0])
+                    return None
+                except BaseException:
+                    await playwright.stop()
+                    raise
+                self._playwright, self._browser, self._context = playwright, browser, context
+        return self._context
+    
+    @staticmethod
+    async def _filter_route(route) -> None:
+        """Abort requests for resources the scraper never reads."""
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def get_many(self, urls: List[str], concurrency: int = 8) -> List[Any]:
+        """Fetch several pages concurrently over HTTP.
+        
+        At most ``concurrency`` requests run at once overall (and
+        ``settings.per_host_concurrency`` per host). Results are returned in
+        the order of ``urls``; failed fetches yield None or the exception.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_one(url: str) -> Optional[str]:
+            async with semaphore:
+                return await self._get_content_requests(url)
+        
+        return await asyncio.gather(*(fetch_one(url) for url in urls), return_exceptions=True)
+    
+    async def stream_parse(self, url: str, target_tag: str) -> AsyncIterator[etree._Element]:
+        """Yield ``target_tag`` elements from a page as its body downloads.
         
-        return webdriver.Chrome(options=options)
+        The page is fed to an incremental lxml parser chunk by chunk, so no
+        full document is built. Each element is cleared once the consumer
+        moves on, so read what is needed from it before the next iteration.
+        The response and data caches are bypassed and failures are not
+        retried, since elements may already have been yielded.
+        """
+        session = await self._ensure_session()
+        netloc = urlparse(url).netloc
+        async with self._host_slots[netloc]:
+            await self._pace(netloc)
+            async with session.get(url) as response:
+                response.raise_for_status()
+                
+                parser = etree.HTMLPullParser(events=("end",), tag=target_tag)
+                async for chunk in response.content.iter_chunked(65536):
+                    parser.feed(chunk)
+                    for _, element in parser.read_events():
+                        yield element
+                        element.clear(keep_tail=True)
+                
+                parser.close()
+                for _, element in parser.read_events():
+                    yield element
+                    element.clear(keep_tail=True)
     
-    def parse_html(self, html_content: str) -> BeautifulSoup:
-        """Parse HTML content with BeautifulSoup."""
-        return BeautifulSoup(html_content, 'html.parser')
+    def parse_html(self, html_content: str, fast: bool = False) -> ParsedPage:
+        """Parse HTML content with BeautifulSoup using the lxml parser.
+        
+        With ``fast`` the lxml tree is returned directly, skipping the
+        BeautifulSoup object model; the extract_* helpers accept either.
+        """
+        if fast:
+            return lxml_html.fromstring(html_content)
+        return BeautifulSoup(html_content, 'lxml')
     
-    async def download_file(self, url: str, save_path: str) -> bool:
-        """Download a file from URL."""
+    async def download_file(self, url: str, save_path: str, use_cache: bool = True) -> bool:
+        """Download a file from URL, revalidating any cached copy unless use_cache."""
         try:
-            await asyncio.sleep(settings.request_delay)
-            response = self.session.get(url, timeout=settings.request_timeout, stream=True)
-            response.raise_for_status()
-            
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
+            await self._fetch_file(url, save_path, revalidate=not use_cache)
             logger.info("File downloaded", url=url, save_path=save_path)
             return True
         except Exception as e:
             logger.error("File download failed", url=url, error=str(e))
             return False
     
-    def extract_links(self, soup: BeautifulSoup, selector: str, base_url: str = "") -> List[str]:
+    @_retry_transient
+    async def _fetch_file(self, url: str, save_path: str, revalidate: bool = False) -> None:
+        """Stream a file to disk, retrying transient failures."""
+        key = file_key(url)
+        cached = await http_cache.get(key)
+        if cached and cached.fresh and not revalidate:
+            await asyncio.to_thread(Path(save_path).write_bytes, cached.body)
+            return
+        
+        session = await self._ensure_session()
+        netloc = urlparse(url).netloc
+        async with self._host_slots[netloc]:
+            await self._pace(netloc)
+            headers = cached.validators() if cached else None
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    await http_cache.refresh(key, response.headers)
+                    await asyncio.to_thread(Path(save_path).write_bytes, cached.body)
+                    return
+                response.raise_for_status()
+                
+                chunks = []
+                with open(save_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(65536):
+                        chunks.append(chunk)
+                        await asyncio.to_thread(f.write, chunk)
+                await http_cache.store(key, b"".join(chunks), "binary", response.headers)
+    
+    def extract_by_key(self, tree: lxml_html.HtmlElement, key: str) -> List[lxml_html.HtmlElement]:
+        """Select elements using a precompiled selector from config.urls by key."""
+        return _COMPILED_SELECTORS[key](tree)
+    
+    def _select(self, soup: ParsedPage, selector: str) -> List[Any]:
+        """Select all elements matching a CSS selector from either page type."""
+        if isinstance(soup, lxml_html.HtmlElement):
+            return _css(selector)(soup)
+        return soup.select(selector)
+    
+    def extract_links(self, soup: ParsedPage, selector: str, base_url: str = "") -> List[str]:
         """Extract links from page using CSS selector."""
         links = []
-        for link in soup.select(selector):
+        for link in self._select(soup, selector):
             href = link.get('href')
             if href:
                 if href.startswith('http'):
                     links.append(href)
                 elif base_url:
-                    links.append(f"{base_url.rstrip('/')}/{href.lstrip('/')}")
+                    links.append(urljoin(base_url, href))
         return links
     
-    def extract_text(self, soup: BeautifulSoup, selector: str) -> Optional[str]:
+    def extract_text(self, soup: ParsedPage, selector: str) -> Optional[str]:
         """Extract text content using CSS selector."""
+        if isinstance(soup, lxml_html.HtmlElement):
+            elements = _css(selector)(soup)
+            return _element_text(elements[0]) if elements else None
         element = soup.select_one(selector)
         return element.get_text(strip=True) if element else None
     
-    def extract_all_text(self, soup: BeautifulSoup, selector: str) -> List[str]:
+    def extract_all_text(self, soup: ParsedPage, selector: str) -> List[str]:
         """Extract text from all matching elements."""
+        if isinstance(soup, lxml_html.HtmlElement):
+            return [_element_text(elem) for elem in _css(selector)(soup)]
         elements = soup.select(selector)
         return [elem.get_text(strip=True) for elem in elements]
     
-    async def retry_request(self, func, *args, **kwargs) -> Any:
-        """Retry a request function with exponential backoff."""
-        for attempt in range(settings.max_retries):
-            try:
-                result = await func(*args, **kwargs)
-                if result is not None:
-                    return result
-            except Exception as e:
-                logger.warning(
-                    "Request attempt failed", 
-                    attempt=attempt + 1, 
-                    max_retries=settings.max_retries,
-                    error=str(e)
-                )
-                
-                if attempt < settings.max_retries - 1:
-                    wait_time = 2 ** attempt
-                    await asyncio.sleep(wait_time)
+    def extract_bundle(self, page: Union[str, ParsedPage],
+                       spec: Mapping[str, Tuple[str, ExtractMode]],
+                       base_url: str = "") -> Dict[str, Any]:
+        """Run several extractions against a single parse of a page.
+        
+        ``spec`` maps each result key to a (selector, mode) pair. Raw HTML is
+        parsed once with lxml; an already parsed page is used as is.
+        """
+        tree = lxml_html.fromstring(page) if isinstance(page, str) else page
         
-        logger.error("All retry attempts failed")
-        return None
+        results = {}
+        for key, (selector, mode) in spec.items():
+            if mode == "one":
+                results[key] = self.extract_text(tree, selector)
+            elif mode == "all":
+                results[key] = self.extract_all_text(tree, selector)
+            elif mode == "links":
+                results[key] = self.extract_links(tree, selector, base_url)
+            else:
+                raise ValueError(f"Unknown extract mode: {mode}")
+        return results
     
-    def close(self):
+    async def close(self):
         """Clean up resources."""
-        if self.session:
-            self.session.close()
-        if self._driver:
-            self._driver.quit()
+        if self._aio:
+            await self._aio.close()
+        http_cache.close()
+        if self._context is not None:
+            await self._context.close()
+            await self._browser.close()
+            await self._playwright.stop()
+            self._playwright = self._browser = self._context = None
 
 
 # Global scraper instance
 scraper = WebScraper()
 
+# web_scraper_simple was the browser-free copy of this module; keep its import
+# path working for existing callers
+_package = __name__.rpartition(".")[0]
+sys.modules.setdefault(f"{_package}.web_scraper_simple" if _package else "web_scraper_simple",
+                       sys.modules[__name__])
+